@@ -0,0 +1,31 @@
+"""Add active_devices counter to licenses
+
+Revision ID: 8c1d2e4f6a10
+Revises: 5a0a73b27471
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1d2e4f6a10'
+down_revision = '5a0a73b27471'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('licenses', sa.Column('active_devices', sa.Integer(), server_default='0', nullable=False, comment='已占用设备数（未禁用的客户端）'))
+    # 回填：统计每个授权下未禁用的客户端数量
+    op.execute(
+        "UPDATE licenses SET active_devices = ("
+        "SELECT COUNT(*) FROM clients "
+        "WHERE clients.license_id = licenses.id "
+        "AND clients.status IN ('NORMAL', 'ABNORMAL'))"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('licenses', 'active_devices')
@@ -0,0 +1,29 @@
+"""Add signing_algorithm to products
+
+Revision ID: 9d3e5f7a8b21
+Revises: 8c1d2e4f6a10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3e5f7a8b21'
+down_revision = '8c1d2e4f6a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 已有产品保持RSA-2048
+    op.add_column('products', sa.Column('signing_algorithm', sa.Enum('RS256', 'ED25519', name='signingalgorithm'), server_default='RS256', nullable=False, comment='Token签名算法'))
+    op.alter_column('products', 'public_key', existing_type=sa.String(length=1000), comment='公钥', existing_comment='RSA公钥', existing_nullable=False)
+    op.alter_column('products', 'private_key', existing_type=sa.String(length=2000), comment='私钥', existing_comment='RSA私钥', existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('products', 'private_key', existing_type=sa.String(length=2000), comment='RSA私钥', existing_comment='私钥', existing_nullable=False)
+    op.alter_column('products', 'public_key', existing_type=sa.String(length=1000), comment='RSA公钥', existing_comment='公钥', existing_nullable=False)
+    op.drop_column('products', 'signing_algorithm')
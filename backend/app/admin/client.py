@@ -7,6 +7,8 @@ from app.models.client import Client, ClientStatus
 from app.schemas.client import ClientResponse
 from app.admin.auth import get_current_admin
 from app.utils.audit_utils import create_audit_log
+from app.services.lookup_cache import lookup_cache
+from app.services.device_slots import release_device_slot, add_device_slot
 
 router = APIRouter()
 
@@ -60,18 +62,21 @@ def disable_client(
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
-    client = db.query(Client).filter(Client.id == client_id).first()
+    client = db.query(Client).filter(Client.id == client_id).with_for_update().first()
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Client not found"
         )
     
-    # 禁用客户端
+    # 禁用客户端，释放其占用的设备名额
+    if client.status != ClientStatus.DISABLED:
+        release_device_slot(db, client.license_id)
     client.status = ClientStatus.DISABLED
     
     db.commit()
     db.refresh(client)
+    lookup_cache.invalidate_client(client.license_id, client.client_fp)
     
     # 记录审计日志
     create_audit_log(
@@ -92,18 +97,21 @@ def enable_client(
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
-    client = db.query(Client).filter(Client.id == client_id).first()
+    client = db.query(Client).filter(Client.id == client_id).with_for_update().first()
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Client not found"
         )
     
-    # 启用客户端
+    # 启用客户端，重新占用设备名额
+    if client.status == ClientStatus.DISABLED:
+        add_device_slot(db, client.license_id)
     client.status = ClientStatus.NORMAL
     
     db.commit()
     db.refresh(client)
+    lookup_cache.invalidate_client(client.license_id, client.client_fp)
     
     # 记录审计日志
     create_audit_log(
@@ -124,7 +132,7 @@ def delete_client(
     db: Session = Depends(get_db),
     current_admin: AdminUser = Depends(get_current_admin)
 ):
-    client = db.query(Client).filter(Client.id == client_id).first()
+    client = db.query(Client).filter(Client.id == client_id).with_for_update().first()
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -141,8 +149,12 @@ def delete_client(
         target_instance=client
     )
     
-    # 删除客户端
+    # 删除客户端，释放其占用的设备名额
+    license_id, client_fp = client.license_id, client.client_fp
+    if client.status != ClientStatus.DISABLED:
+        release_device_slot(db, license_id)
     db.delete(client)
     db.commit()
+    lookup_cache.invalidate_client(license_id, client_fp)
     
     return None
\ No newline at end of file
@@ -11,6 +11,10 @@ from app.models.client import Client
 from app.models.audit_log import AuditLog
 from app.schemas.dashboard import DashboardResponse, DashboardStatsResponse
 from app.admin.auth import get_current_admin
+from app.services.key_registry import key_registry
+from app.services.heartbeat_buffer import heartbeat_buffer
+from app.services.lookup_cache import lookup_cache
+from app.services.key_pool import key_pool
 
 router = APIRouter()
 
@@ -82,3 +86,13 @@ def get_dashboard_data(
         "healthStatus": health_status,
         "recentActivities": formatted_activities
     }
+
+# 获取运行时指标
+@router.get("/metrics")
+def get_metrics(current_admin: AdminUser = Depends(get_current_admin)):
+    return {
+        "keyRegistry": key_registry.stats(),
+        "heartbeatBuffer": heartbeat_buffer.stats(),
+        "lookupCache": lookup_cache.stats(),
+        "keyPool": key_pool.stats()
+    }
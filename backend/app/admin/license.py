@@ -9,6 +9,7 @@ from app.models.product import Product
 from app.schemas.license import LicenseCreate, LicenseUpdate, LicenseResponse
 from app.admin.auth import get_current_admin
 from app.utils.audit_utils import create_audit_log
+from app.services.lookup_cache import lookup_cache
 
 router = APIRouter()
 
@@ -125,6 +126,7 @@ def update_license(
     
     db.commit()
     db.refresh(license)
+    lookup_cache.invalidate_license(license.license_key)
     
     # 记录审计日志
     create_audit_log(
@@ -158,6 +160,7 @@ def revoke_license(
     
     db.commit()
     db.refresh(license)
+    lookup_cache.invalidate_license(license.license_key)
     
     # 记录审计日志
     create_audit_log(
@@ -200,7 +203,10 @@ def delete_license(
     )
     
     # 删除授权
+    license_key = license.license_key
     db.delete(license)
     db.commit()
+    lookup_cache.invalidate_license(license_key)
+    lookup_cache.invalidate_license_clients(license_id)
     
     return None
\ No newline at end of file
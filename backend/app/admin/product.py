@@ -2,12 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
-from app.core.rsa import generate_rsa_key_pair
+from app.core.rsa import generate_key_pair
 from app.models.admin_user import AdminUser
-from app.models.product import Product, ProductStatus
+from app.models.product import Product, ProductStatus, SigningAlgorithm
 from app.schemas.product import ProductCreate, ProductUpdate, ProductResponse
 from app.admin.auth import get_current_admin
 from app.utils.audit_utils import create_audit_log
+from app.services.key_registry import key_registry
+from app.services.lookup_cache import lookup_cache
+from app.services.key_pool import key_pool
 
 router = APIRouter()
 
@@ -26,8 +29,10 @@ def create_product(
             detail="Product code already exists"
         )
     
-    # 生成RSA密钥对
-    private_key, public_key = generate_rsa_key_pair()
+    # 按签名算法生成密钥对，RSA优先从预生成池取用，池为空时同步生成
+    signing_algorithm = product.signing_algorithm or SigningAlgorithm.RS256
+    key_pair = key_pool.take() if signing_algorithm == SigningAlgorithm.RS256 else None
+    private_key, public_key = key_pair or generate_key_pair(signing_algorithm.value)
     
     # 创建产品
     db_product = Product(
@@ -35,6 +40,7 @@ def create_product(
         name=product.name,
         public_key=public_key,
         private_key=private_key,
+        signing_algorithm=signing_algorithm,
         heartbeat_interval=product.heartbeat_interval,
         status=product.status
     )
@@ -111,6 +117,10 @@ def update_product(
     db.commit()
     db.refresh(product)
     
+    # 失效该产品已缓存的密钥对象和查询快照
+    key_registry.invalidate(product.product_code)
+    lookup_cache.invalidate_product(product.product_code)
+    
     # 记录审计日志
     create_audit_log(
         db=db,
@@ -148,7 +158,12 @@ def delete_product(
         target_instance=product
     )
     
+    product_code = product.product_code
     db.delete(product)
     db.commit()
     
+    # 失效该产品已缓存的密钥对象和查询快照
+    key_registry.invalidate(product_code)
+    lookup_cache.invalidate_product(product_code)
+    
     return None
\ No newline at end of file
@@ -1,14 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import date, datetime
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.rsa import verify_signature, generate_license_token
+from app.core.rsa import verify_token_signature, generate_license_token
 from app.models.license import License, LicenseStatus
 from app.models.product import Product, ProductStatus
 from app.models.client import Client, ClientType, ClientStatus
+from app.services.heartbeat_buffer import heartbeat_buffer
+from app.services.lookup_cache import lookup_cache
+from app.services.device_slots import reserve_device_slot
 from app.schemas.license_api import (
     ActivateRequest, ActivateResponse,
     HeartbeatRequest, HeartbeatResponse,
+    BatchHeartbeatRequest, BatchHeartbeatResponse,
     StatusRequest, StatusResponse
 )
 
@@ -21,7 +27,7 @@ def activate(
     db: Session = Depends(get_db)
 ):
     # 1. 查找License
-    license = db.query(License).filter(License.license_key == request.license_key).first()
+    license = lookup_cache.get_license(db, request.license_key)
     if not license:
         return ActivateResponse(
             success=False,
@@ -36,15 +42,18 @@ def activate(
         )
     
     if license.expire_at < date.today():
-        license.status = LicenseStatus.EXPIRED
+        db.query(License).filter(License.id == license.id).update(
+            {License.status: LicenseStatus.EXPIRED}, synchronize_session=False
+        )
         db.commit()
+        lookup_cache.invalidate_license(license.license_key)
         return ActivateResponse(
             success=False,
             message="License has expired"
         )
     
     # 3. 查找产品
-    product = db.query(Product).filter(Product.product_code == license.product_code).first()
+    product = lookup_cache.get_product(db, license.product_code)
     if not product:
         return ActivateResponse(
             success=False,
@@ -57,29 +66,25 @@ def activate(
             message="Product has been disabled"
         )
     
-    # 4. 检查已激活设备数量
-    active_clients = db.query(Client).filter(
-        Client.license_id == license.id,
-        Client.status == ClientStatus.NORMAL
-    ).count()
-    
-    if active_clients >= license.max_devices:
-        return ActivateResponse(
-            success=False,
-            message="Maximum number of devices reached"
-        )
-    
-    # 5. 检查客户端指纹是否已绑定
+    # 4. 检查客户端指纹是否已绑定（加行锁，与管理端启用/禁用串行）
     existing_client = db.query(Client).filter(
         Client.license_id == license.id,
         Client.client_fp == request.client_fp
-    ).first()
+    ).with_for_update().first()
+    
+    # 5. 新客户端或被禁用的客户端需要原子占用一个设备名额
+    if not existing_client or existing_client.status == ClientStatus.DISABLED:
+        if not reserve_device_slot(db, license.id):
+            db.rollback()
+            return ActivateResponse(
+                success=False,
+                message="Maximum number of devices reached"
+            )
     
     if existing_client:
         # 如果客户端已存在，更新状态为正常
         existing_client.status = ClientStatus.NORMAL
         existing_client.last_heartbeat = datetime.utcnow()
-        db.commit()
     else:
         # 6. 创建新客户端
         client = Client(
@@ -93,9 +98,21 @@ def activate(
         
     # 7. 更新License状态为已激活
     if license.status == LicenseStatus.UNACTIVATED:
-        license.status = LicenseStatus.ACTIVATED
+        db.query(License).filter(License.id == license.id).update(
+            {License.status: LicenseStatus.ACTIVATED}, synchronize_session=False
+        )
     
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # 同一指纹并发激活，回滚后名额占用一并撤销
+        db.rollback()
+        return ActivateResponse(
+            success=False,
+            message="Concurrent activation in progress, please retry"
+        )
+    lookup_cache.invalidate_license(license.license_key)
+    lookup_cache.invalidate_client(license.id, request.client_fp)
     
     # 8. 生成License Token
     # 将date对象转换为datetime对象，然后获取timestamp
@@ -106,7 +123,8 @@ def activate(
         license_key=license.license_key,
         client_fp=request.client_fp,
         expire_at=expire_at,
-        private_key=product.private_key
+        private_key=product.private_key,
+        algorithm=product.signing_algorithm
     )
     
     return ActivateResponse(
@@ -127,7 +145,7 @@ def heartbeat(
         signature = request.token["signature"]
         
         # 2. 查找产品
-        product = db.query(Product).filter(Product.product_code == token_data["product"]).first()
+        product = lookup_cache.get_product(db, token_data["product"])
         if not product:
             return HeartbeatResponse(
                 success=False,
@@ -135,14 +153,14 @@ def heartbeat(
             )
         
         # 3. 验证Token签名
-        if not verify_signature(token_data, signature, product.public_key):
+        if not verify_token_signature(request.token, product.public_key, product.signing_algorithm, product_code=product.product_code):
             return HeartbeatResponse(
                 success=False,
                 message="Invalid token signature"
             )
         
         # 4. 查找License
-        license = db.query(License).filter(License.license_key == token_data["license_key"]).first()
+        license = lookup_cache.get_license(db, token_data["license_key"])
         if not license:
             return HeartbeatResponse(
                 success=False,
@@ -157,10 +175,7 @@ def heartbeat(
             )
         
         # 6. 查找客户端
-        client = db.query(Client).filter(
-            Client.license_id == license.id,
-            Client.client_fp == token_data["client_fp"]
-        ).first()
+        client = lookup_cache.get_client(db, license.id, token_data["client_fp"])
         
         if not client:
             return HeartbeatResponse(
@@ -174,9 +189,15 @@ def heartbeat(
                 message="Client has been disabled"
             )
         
-        # 7. 更新心跳时间
-        client.last_heartbeat = datetime.utcnow()
-        db.commit()
+        # 7. 更新心跳时间（启用写缓冲时由后台批量写回）
+        now = datetime.utcnow()
+        if settings.HEARTBEAT_BUFFER_ENABLED:
+            heartbeat_buffer.record(client.id, now, stored=client.last_heartbeat)
+        else:
+            db.query(Client).filter(Client.id == client.id).update(
+                {Client.last_heartbeat: now}, synchronize_session=False
+            )
+            db.commit()
         
         return HeartbeatResponse(
             success=True,
@@ -188,6 +209,77 @@ def heartbeat(
             message="Invalid token format"
         )
 
+# 批量心跳API
+@router.post("/heartbeat/batch", response_model=BatchHeartbeatResponse)
+def heartbeat_batch(
+    request: BatchHeartbeatRequest,
+    db: Session = Depends(get_db)
+):
+    results = [None] * len(request.tokens)
+    
+    # 1. 解析Token并按产品分组
+    tokens_by_product = {}
+    for index, token in enumerate(request.tokens):
+        try:
+            product_code = token["token"]["product"]
+            if not {"license_key", "client_fp"} <= token["token"].keys() or "signature" not in token:
+                raise ValueError("Invalid token format")
+        except Exception:
+            results[index] = HeartbeatResponse(success=False, message="Invalid token format")
+            continue
+        tokens_by_product.setdefault(product_code, []).append((index, token))
+    
+    # 2. 按产品验证Token签名，每个产品只加载一次公钥
+    verified = []
+    for product_code, items in tokens_by_product.items():
+        product = lookup_cache.get_product(db, product_code)
+        for index, token in items:
+            if not product:
+                results[index] = HeartbeatResponse(success=False, message="Product not found")
+            elif not verify_token_signature(token, product.public_key, product.signing_algorithm, product_code=product.product_code):
+                results[index] = HeartbeatResponse(success=False, message="Invalid token signature")
+            else:
+                verified.append((index, token["token"]))
+    
+    # 3. 批量查找License并检查状态
+    licenses = lookup_cache.get_licenses(db, [token_data["license_key"] for _, token_data in verified])
+    pending = []
+    for index, token_data in verified:
+        license = licenses.get(token_data["license_key"])
+        if not license:
+            results[index] = HeartbeatResponse(success=False, message="License not found")
+        elif license.status in [LicenseStatus.REVOKED, LicenseStatus.EXPIRED]:
+            results[index] = HeartbeatResponse(success=False, message="License is invalid")
+        else:
+            pending.append((index, (license.id, token_data["client_fp"])))
+    
+    # 4. 批量查找客户端并检查状态
+    clients = lookup_cache.get_clients(db, [key for _, key in pending])
+    alive = {}
+    for index, key in pending:
+        client = clients.get(key)
+        if not client:
+            results[index] = HeartbeatResponse(success=False, message="Client not found")
+        elif client.status == ClientStatus.DISABLED:
+            results[index] = HeartbeatResponse(success=False, message="Client has been disabled")
+        else:
+            alive[client.id] = client
+            results[index] = HeartbeatResponse(success=True, message="Heartbeat successful")
+    
+    # 5. 批量更新心跳时间
+    if alive:
+        now = datetime.utcnow()
+        if settings.HEARTBEAT_BUFFER_ENABLED:
+            for client in alive.values():
+                heartbeat_buffer.record(client.id, now, stored=client.last_heartbeat)
+        else:
+            db.query(Client).filter(Client.id.in_(list(alive))).update(
+                {Client.last_heartbeat: now}, synchronize_session=False
+            )
+            db.commit()
+    
+    return BatchHeartbeatResponse(success=True, results=results)
+
 # 状态API
 @router.post("/status", response_model=StatusResponse)
 def status(
@@ -200,7 +292,7 @@ def status(
         signature = request.token["signature"]
         
         # 2. 查找产品
-        product = db.query(Product).filter(Product.product_code == token_data["product"]).first()
+        product = lookup_cache.get_product(db, token_data["product"])
         if not product:
             return StatusResponse(
                 success=False,
@@ -208,14 +300,14 @@ def status(
             )
         
         # 3. 验证Token签名
-        if not verify_signature(token_data, signature, product.public_key):
+        if not verify_token_signature(request.token, product.public_key, product.signing_algorithm, product_code=product.product_code):
             return StatusResponse(
                 success=False,
                 message="Invalid token signature"
             )
         
         # 4. 查找License
-        license = db.query(License).filter(License.license_key == token_data["license_key"]).first()
+        license = lookup_cache.get_license(db, token_data["license_key"])
         if not license:
             return StatusResponse(
                 success=False,
@@ -238,10 +330,7 @@ def status(
             )
         
         # 6. 查找客户端
-        client = db.query(Client).filter(
-            Client.license_id == license.id,
-            Client.client_fp == token_data["client_fp"]
-        ).first()
+        client = lookup_cache.get_client(db, license.id, token_data["client_fp"])
         
         if not client:
             return StatusResponse(
@@ -0,0 +1,364 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.rsa import verify_token_signature, generate_license_token
+from app.models.license import License, LicenseStatus
+from app.models.product import ProductStatus
+from app.models.client import Client, ClientType, ClientStatus
+from app.services.heartbeat_buffer import heartbeat_buffer
+from app.services.lookup_cache import lookup_cache
+from app.services.device_slots import areserve_device_slot
+from app.schemas.license_api import (
+    ActivateRequest, ActivateResponse,
+    HeartbeatRequest, HeartbeatResponse,
+    BatchHeartbeatRequest, BatchHeartbeatResponse,
+    StatusRequest, StatusResponse
+)
+
+router = APIRouter()
+
+# 客户端API的异步实现，启用DATABASE_ASYNC时替代app.api.v1.license
+
+# 激活API
+@router.post("/activate", response_model=ActivateResponse)
+async def activate(
+    request: ActivateRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # 1. 查找License
+    license = await lookup_cache.aget_license(db, request.license_key)
+    if not license:
+        return ActivateResponse(
+            success=False,
+            message="Invalid license key"
+        )
+    
+    # 2. 检查License状态
+    if license.status == LicenseStatus.REVOKED:
+        return ActivateResponse(
+            success=False,
+            message="License has been revoked"
+        )
+    
+    if license.expire_at < date.today():
+        await db.execute(
+            update(License).where(License.id == license.id).values(status=LicenseStatus.EXPIRED)
+        )
+        await db.commit()
+        lookup_cache.invalidate_license(license.license_key)
+        return ActivateResponse(
+            success=False,
+            message="License has expired"
+        )
+    
+    # 3. 查找产品
+    product = await lookup_cache.aget_product(db, license.product_code)
+    if not product:
+        return ActivateResponse(
+            success=False,
+            message="Product not found"
+        )
+    
+    if product.status == ProductStatus.DISABLED:
+        return ActivateResponse(
+            success=False,
+            message="Product has been disabled"
+        )
+    
+    # 4. 检查客户端指纹是否已绑定（加行锁，与管理端启用/禁用串行）
+    existing_client = (await db.execute(select(Client).where(
+        Client.license_id == license.id,
+        Client.client_fp == request.client_fp
+    ).with_for_update())).scalars().first()
+    
+    # 5. 新客户端或被禁用的客户端需要原子占用一个设备名额
+    if not existing_client or existing_client.status == ClientStatus.DISABLED:
+        if not await areserve_device_slot(db, license.id):
+            await db.rollback()
+            return ActivateResponse(
+                success=False,
+                message="Maximum number of devices reached"
+            )
+    
+    if existing_client:
+        # 如果客户端已存在，更新状态为正常
+        existing_client.status = ClientStatus.NORMAL
+        existing_client.last_heartbeat = datetime.utcnow()
+    else:
+        # 6. 创建新客户端
+        client = Client(
+            license_id=license.id,
+            product_code=license.product_code,
+            client_fp=request.client_fp,
+            client_type=ClientType(request.client_type.lower()),
+            status=ClientStatus.NORMAL
+        )
+        db.add(client)
+        
+    # 7. 更新License状态为已激活
+    if license.status == LicenseStatus.UNACTIVATED:
+        await db.execute(
+            update(License).where(License.id == license.id).values(status=LicenseStatus.ACTIVATED)
+        )
+    
+    try:
+        await db.commit()
+    except IntegrityError:
+        # 同一指纹并发激活，回滚后名额占用一并撤销
+        await db.rollback()
+        return ActivateResponse(
+            success=False,
+            message="Concurrent activation in progress, please retry"
+        )
+    lookup_cache.invalidate_license(license.license_key)
+    lookup_cache.invalidate_client(license.id, request.client_fp)
+    
+    # 8. 生成License Token
+    # 将date对象转换为datetime对象，然后获取timestamp
+    expire_datetime = datetime.combine(license.expire_at, datetime.min.time())
+    expire_at = int(expire_datetime.timestamp())
+    token = generate_license_token(
+        product=license.product_code,
+        license_key=license.license_key,
+        client_fp=request.client_fp,
+        expire_at=expire_at,
+        private_key=product.private_key,
+        algorithm=product.signing_algorithm
+    )
+    
+    return ActivateResponse(
+        success=True,
+        message="Activation successful",
+        token=token
+    )
+
+# 心跳API
+@router.post("/heartbeat", response_model=HeartbeatResponse)
+async def heartbeat(
+    request: HeartbeatRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        # 1. 解析Token
+        token_data = request.token["token"]
+        signature = request.token["signature"]
+        
+        # 2. 查找产品
+        product = await lookup_cache.aget_product(db, token_data["product"])
+        if not product:
+            return HeartbeatResponse(
+                success=False,
+                message="Product not found"
+            )
+        
+        # 3. 验证Token签名
+        if not verify_token_signature(request.token, product.public_key, product.signing_algorithm, product_code=product.product_code):
+            return HeartbeatResponse(
+                success=False,
+                message="Invalid token signature"
+            )
+        
+        # 4. 查找License
+        license = await lookup_cache.aget_license(db, token_data["license_key"])
+        if not license:
+            return HeartbeatResponse(
+                success=False,
+                message="License not found"
+            )
+        
+        # 5. 检查License状态
+        if license.status in [LicenseStatus.REVOKED, LicenseStatus.EXPIRED]:
+            return HeartbeatResponse(
+                success=False,
+                message="License is invalid"
+            )
+        
+        # 6. 查找客户端
+        client = await lookup_cache.aget_client(db, license.id, token_data["client_fp"])
+        
+        if not client:
+            return HeartbeatResponse(
+                success=False,
+                message="Client not found"
+            )
+        
+        if client.status == ClientStatus.DISABLED:
+            return HeartbeatResponse(
+                success=False,
+                message="Client has been disabled"
+            )
+        
+        # 7. 更新心跳时间（启用写缓冲时由后台批量写回）
+        now = datetime.utcnow()
+        if settings.HEARTBEAT_BUFFER_ENABLED:
+            heartbeat_buffer.record(client.id, now, stored=client.last_heartbeat)
+        else:
+            await db.execute(
+                update(Client).where(Client.id == client.id).values(last_heartbeat=now)
+            )
+            await db.commit()
+        
+        return HeartbeatResponse(
+            success=True,
+            message="Heartbeat successful"
+        )
+    except Exception as e:
+        return HeartbeatResponse(
+            success=False,
+            message="Invalid token format"
+        )
+
+# 批量心跳API
+@router.post("/heartbeat/batch", response_model=BatchHeartbeatResponse)
+async def heartbeat_batch(
+    request: BatchHeartbeatRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    results = [None] * len(request.tokens)
+    
+    # 1. 解析Token并按产品分组
+    tokens_by_product = {}
+    for index, token in enumerate(request.tokens):
+        try:
+            product_code = token["token"]["product"]
+            if not {"license_key", "client_fp"} <= token["token"].keys() or "signature" not in token:
+                raise ValueError("Invalid token format")
+        except Exception:
+            results[index] = HeartbeatResponse(success=False, message="Invalid token format")
+            continue
+        tokens_by_product.setdefault(product_code, []).append((index, token))
+    
+    # 2. 按产品验证Token签名，每个产品只加载一次公钥
+    verified = []
+    for product_code, items in tokens_by_product.items():
+        product = await lookup_cache.aget_product(db, product_code)
+        for index, token in items:
+            if not product:
+                results[index] = HeartbeatResponse(success=False, message="Product not found")
+            elif not verify_token_signature(token, product.public_key, product.signing_algorithm, product_code=product.product_code):
+                results[index] = HeartbeatResponse(success=False, message="Invalid token signature")
+            else:
+                verified.append((index, token["token"]))
+    
+    # 3. 批量查找License并检查状态
+    licenses = await lookup_cache.aget_licenses(db, [token_data["license_key"] for _, token_data in verified])
+    pending = []
+    for index, token_data in verified:
+        license = licenses.get(token_data["license_key"])
+        if not license:
+            results[index] = HeartbeatResponse(success=False, message="License not found")
+        elif license.status in [LicenseStatus.REVOKED, LicenseStatus.EXPIRED]:
+            results[index] = HeartbeatResponse(success=False, message="License is invalid")
+        else:
+            pending.append((index, (license.id, token_data["client_fp"])))
+    
+    # 4. 批量查找客户端并检查状态
+    clients = await lookup_cache.aget_clients(db, [key for _, key in pending])
+    alive = {}
+    for index, key in pending:
+        client = clients.get(key)
+        if not client:
+            results[index] = HeartbeatResponse(success=False, message="Client not found")
+        elif client.status == ClientStatus.DISABLED:
+            results[index] = HeartbeatResponse(success=False, message="Client has been disabled")
+        else:
+            alive[client.id] = client
+            results[index] = HeartbeatResponse(success=True, message="Heartbeat successful")
+    
+    # 5. 批量更新心跳时间
+    if alive:
+        now = datetime.utcnow()
+        if settings.HEARTBEAT_BUFFER_ENABLED:
+            for client in alive.values():
+                heartbeat_buffer.record(client.id, now, stored=client.last_heartbeat)
+        else:
+            await db.execute(
+                update(Client).where(Client.id.in_(list(alive))).values(last_heartbeat=now)
+            )
+            await db.commit()
+    
+    return BatchHeartbeatResponse(success=True, results=results)
+
+# 状态API
+@router.post("/status", response_model=StatusResponse)
+async def status(
+    request: StatusRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        # 1. 解析Token
+        token_data = request.token["token"]
+        signature = request.token["signature"]
+        
+        # 2. 查找产品
+        product = await lookup_cache.aget_product(db, token_data["product"])
+        if not product:
+            return StatusResponse(
+                success=False,
+                message="Product not found"
+            )
+        
+        # 3. 验证Token签名
+        if not verify_token_signature(request.token, product.public_key, product.signing_algorithm, product_code=product.product_code):
+            return StatusResponse(
+                success=False,
+                message="Invalid token signature"
+            )
+        
+        # 4. 查找License
+        license = await lookup_cache.aget_license(db, token_data["license_key"])
+        if not license:
+            return StatusResponse(
+                success=False,
+                message="License not found"
+            )
+        
+        # 5. 检查License状态
+        if license.status == LicenseStatus.REVOKED:
+            return StatusResponse(
+                success=False,
+                message="License has been revoked",
+                status="revoked"
+            )
+        
+        if license.status == LicenseStatus.EXPIRED or license.expire_at < date.today():
+            return StatusResponse(
+                success=False,
+                message="License has expired",
+                status="expired"
+            )
+        
+        # 6. 查找客户端
+        client = await lookup_cache.aget_client(db, license.id, token_data["client_fp"])
+        
+        if not client:
+            return StatusResponse(
+                success=False,
+                message="Client not found"
+            )
+        
+        if client.status == ClientStatus.DISABLED:
+            return StatusResponse(
+                success=False,
+                message="Client has been disabled",
+                status="disabled"
+            )
+        
+        # 7. 返回状态
+        # 将date对象转换为datetime对象，然后获取timestamp
+        expire_datetime = datetime.combine(license.expire_at, datetime.min.time())
+        return StatusResponse(
+            success=True,
+            message="License is valid",
+            status="valid",
+            expire_at=int(expire_datetime.timestamp())
+        )
+    except Exception as e:
+        return StatusResponse(
+            success=False,
+            message="Invalid token format"
+        )
\ No newline at end of file
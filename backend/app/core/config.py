@@ -4,6 +4,10 @@ from typing import Optional
 class Settings(BaseSettings):
     # 数据库配置
     DATABASE_URL: str
+    # 客户端API使用异步数据库引擎
+    DATABASE_ASYNC: bool = False
+    # 异步数据库URL，为空时根据DATABASE_URL推导（pymysql→aiomysql，sqlite→aiosqlite）
+    ASYNC_DATABASE_URL: Optional[str] = None
     
     # JWT配置
     JWT_SECRET_KEY: str
@@ -15,6 +19,27 @@ class Settings(BaseSettings):
     SERVER_PORT: int = 8000
     SERVER_RELOAD: bool = True
     
+    # 心跳写缓冲配置
+    HEARTBEAT_BUFFER_ENABLED: bool = True
+    HEARTBEAT_FLUSH_INTERVAL: float = 5.0
+    HEARTBEAT_FLUSH_BATCH_SIZE: int = 1000
+    HEARTBEAT_BUFFER_MAX_SIZE: int = 100000
+    # 心跳合并窗口（秒），库中时间比窗口更新时跳过写入，0表示不跳过
+    HEARTBEAT_COARSEN_SECONDS: int = 0
+    
+    # 查询缓存配置，TTL即其他工作进程中吊销生效的最长延迟（秒）
+    LOOKUP_CACHE_ENABLED: bool = True
+    LOOKUP_CACHE_TTL: float = 30.0
+    LOOKUP_CACHE_MAX_SIZE: int = 100000
+    
+    # RSA密钥预生成池配置
+    KEY_POOL_ENABLED: bool = True
+    KEY_POOL_SIZE: int = 8
+    KEY_POOL_WORKERS: int = 1
+    # 持久化路径和Fernet加密密钥，两者都配置时才会把剩余密钥对加密落盘
+    KEY_POOL_PERSIST_PATH: Optional[str] = None
+    KEY_POOL_ENCRYPTION_KEY: Optional[str] = None
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
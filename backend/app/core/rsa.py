@@ -2,9 +2,17 @@ from datetime import datetime
 from Crypto.PublicKey import RSA
 from Crypto.Signature import PKCS1_v1_5
 from Crypto.Hash import SHA256
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 import base64
 import json
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional, Callable
+
+# 签名算法，写入Token头部的alg字段
+ALG_RS256 = "RS256"    # RSA-2048 PKCS#1 v1.5 + SHA-256（默认）
+ALG_EDDSA = "EdDSA"    # Ed25519（使用cryptography库的OpenSSL实现）
+SUPPORTED_ALGORITHMS = (ALG_RS256, ALG_EDDSA)
 
 # 生成RSA密钥对
 def generate_rsa_key_pair() -> Tuple[str, str]:
@@ -13,36 +21,103 @@ def generate_rsa_key_pair() -> Tuple[str, str]:
     public_key = key.publickey().export_key().decode("utf-8")
     return private_key, public_key
 
+# 生成Ed25519密钥对
+def generate_ed25519_key_pair() -> Tuple[str, str]:
+    key = Ed25519PrivateKey.generate()
+    private_key = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode("utf-8")
+    public_key = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode("utf-8")
+    return private_key, public_key
+
+# 按算法生成密钥对
+def generate_key_pair(algorithm: str = ALG_RS256) -> Tuple[str, str]:
+    if algorithm == ALG_EDDSA:
+        return generate_ed25519_key_pair()
+    return generate_rsa_key_pair()
+
+# 根据私钥创建签名器，返回 sign(message) -> signature
+def create_signer(private_key: str, algorithm: str = ALG_RS256) -> Callable[[bytes], bytes]:
+    if algorithm == ALG_EDDSA:
+        return serialization.load_pem_private_key(private_key.encode("utf-8"), password=None).sign
+    signer = PKCS1_v1_5.new(RSA.import_key(private_key))
+    return lambda message: signer.sign(SHA256.new(message))
+
+# 根据公钥创建验证器，返回 verify(message, signature) -> bool
+def create_verifier(public_key: str, algorithm: str = ALG_RS256) -> Callable[[bytes, bytes], bool]:
+    if algorithm == ALG_EDDSA:
+        verifier = serialization.load_pem_public_key(public_key.encode("utf-8"))
+
+        def verify(message: bytes, signature: bytes) -> bool:
+            try:
+                verifier.verify(signature, message)
+                return True
+            except InvalidSignature:
+                return False
+        return verify
+    verifier = PKCS1_v1_5.new(RSA.import_key(public_key))
+    return lambda message, signature: verifier.verify(SHA256.new(message), signature)
+
+# 序列化待签名数据
+def _canonical_bytes(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, sort_keys=True).encode("utf-8")
+
 # 签名数据
-def sign_data(data: Dict[str, Any], private_key: str) -> str:
-    # 将数据转换为JSON字符串
-    json_data = json.dumps(data, sort_keys=True)
-    # 创建SHA-256哈希
-    hash_obj = SHA256.new(json_data.encode("utf-8"))
-    # 加载私钥
-    rsa_key = RSA.import_key(private_key)
-    # 创建签名器
-    signer = PKCS1_v1_5.new(rsa_key)
-    # 生成签名
-    signature = signer.sign(hash_obj)
-    # 对签名进行Base64编码
+# 传入product_code时从密钥注册表获取已解析的签名器
+def sign_data(
+    data: Dict[str, Any],
+    private_key: str,
+    product_code: Optional[str] = None,
+    algorithm: str = ALG_RS256
+) -> str:
+    # 获取签名器
+    if product_code:
+        from app.services.key_registry import key_registry
+        signer = key_registry.get_signer(product_code, private_key, algorithm)
+    else:
+        signer = create_signer(private_key, algorithm)
+    # 生成签名并进行Base64编码
+    signature = signer(_canonical_bytes(data))
     return base64.b64encode(signature).decode("utf-8")
 
 # 验证签名
-def verify_signature(data: Dict[str, Any], signature: str, public_key: str) -> bool:
+# 传入product_code时从密钥注册表获取已解析的验证器
+def verify_signature(
+    data: Dict[str, Any],
+    signature: str,
+    public_key: str,
+    product_code: Optional[str] = None,
+    algorithm: str = ALG_RS256
+) -> bool:
     try:
-        # 将数据转换为JSON字符串
-        json_data = json.dumps(data, sort_keys=True)
-        # 创建SHA-256哈希
-        hash_obj = SHA256.new(json_data.encode("utf-8"))
-        # 加载公钥
-        rsa_key = RSA.import_key(public_key)
-        # 创建验证器
-        verifier = PKCS1_v1_5.new(rsa_key)
-        # 解码Base64签名
-        decoded_signature = base64.b64decode(signature)
-        # 验证签名
-        return verifier.verify(hash_obj, decoded_signature)
+        # 获取验证器
+        if product_code:
+            from app.services.key_registry import key_registry
+            verifier = key_registry.get_verifier(product_code, public_key, algorithm)
+        else:
+            verifier = create_verifier(public_key, algorithm)
+        # 解码Base64签名并验证
+        return verifier(_canonical_bytes(data), base64.b64decode(signature))
+    except Exception:
+        return False
+
+# 验证License Token的签名
+# Token头部的alg必须与产品配置的算法一致，未携带alg的旧Token视为RS256
+def verify_token_signature(
+    token: Dict[str, Any],
+    public_key: str,
+    algorithm: str = ALG_RS256,
+    product_code: Optional[str] = None
+) -> bool:
+    try:
+        if token.get("alg", ALG_RS256) != algorithm:
+            return False
+        return verify_signature(token["token"], token["signature"], public_key, product_code, algorithm)
     except Exception:
         return False
 
@@ -52,7 +127,8 @@ def generate_license_token(
     license_key: str,
     client_fp: str,
     expire_at: int,
-    private_key: str
+    private_key: str,
+    algorithm: str = ALG_RS256
 ) -> Dict[str, Any]:
     # 创建Token数据
     token_data = {
@@ -64,21 +140,20 @@ def generate_license_token(
         "exp": expire_at
     }
     # 生成签名
-    signature = sign_data(token_data, private_key)
+    signature = sign_data(token_data, private_key, product_code=product, algorithm=algorithm)
     # 返回带有签名的Token
     return {
+        "alg": algorithm,
         "token": token_data,
         "signature": signature
     }
 
 # 验证License Token
-def verify_license_token(token: Dict[str, Any], public_key: str) -> bool:
+def verify_license_token(token: Dict[str, Any], public_key: str, algorithm: str = ALG_RS256) -> bool:
     try:
-        # 从Token中提取数据和签名
         token_data = token["token"]
-        signature = token["signature"]
         # 验证签名
-        if not verify_signature(token_data, signature, public_key):
+        if not verify_token_signature(token, public_key, algorithm, product_code=token_data.get("product")):
             return False
         # 验证过期时间
         current_time = int(datetime.utcnow().timestamp())
@@ -86,4 +161,4 @@ def verify_license_token(token: Dict[str, Any], public_key: str) -> bool:
             return False
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
@@ -1,5 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import async_engine
+from app.services.heartbeat_buffer import heartbeat_buffer
+from app.services.key_pool import key_pool
 
 app = FastAPI(
     title="hex-auth 授权中心",
@@ -16,6 +21,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 启动后台服务
+@app.on_event("startup")
+def startup():
+    if settings.HEARTBEAT_BUFFER_ENABLED:
+        heartbeat_buffer.start()
+    if settings.KEY_POOL_ENABLED:
+        key_pool.start()
+
+# 停止后台服务并写回缓冲数据
+@app.on_event("shutdown")
+async def shutdown():
+    await run_in_threadpool(heartbeat_buffer.stop)
+    await run_in_threadpool(key_pool.stop)
+    if async_engine is not None:
+        await async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {"message": "hex-auth 授权中心 API"}
@@ -27,7 +48,10 @@ from app.admin.license import router as license_router
 from app.admin.client import router as client_router
 from app.admin.audit import router as audit_router
 from app.admin.dashboard import router as dashboard_router
-from app.api.v1.license import router as license_api_router
+if settings.DATABASE_ASYNC:
+    from app.api.v1.license_async import router as license_api_router
+else:
+    from app.api.v1.license import router as license_api_router
 
 # 注册路由
 app.include_router(auth_router, prefix="/admin/auth", tags=["admin-auth"])
@@ -1,4 +1,4 @@
-from app.models.product import Product, ProductStatus
+from app.models.product import Product, ProductStatus, SigningAlgorithm
 from app.models.license import License, LicenseStatus
 from app.models.client import Client, ClientType, ClientStatus
 from app.models.admin_user import AdminUser, AdminStatus
@@ -16,6 +16,7 @@ class License(Base):
     license_key = Column(String(50), unique=True, index=True, nullable=False, comment="授权码")
     product_code = Column(String(50), index=True, nullable=False, comment="关联产品标识")
     max_devices = Column(Integer, default=1, comment="最大设备数限制")
+    active_devices = Column(Integer, default=0, nullable=False, comment="已占用设备数（未禁用的客户端）")
     expire_at = Column(Date, nullable=False, comment="过期时间")
     status = Column(Enum(LicenseStatus), default=LicenseStatus.UNACTIVATED, comment="状态")
     remark = Column(String(200), nullable=True, comment="备注信息")
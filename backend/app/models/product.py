@@ -7,14 +7,19 @@ class ProductStatus(str, enum.Enum):
     ENABLED = "enabled"
     DISABLED = "disabled"
 
+class SigningAlgorithm(str, enum.Enum):
+    RS256 = "RS256"
+    ED25519 = "EdDSA"
+
 class Product(Base):
     __tablename__ = "products"
     
     id = Column(Integer, primary_key=True, index=True, comment="主键ID")
     product_code = Column(String(50), unique=True, index=True, nullable=False, comment="产品唯一标识")
     name = Column(String(100), nullable=False, comment="产品名称")
-    public_key = Column(String(1000), nullable=False, comment="RSA公钥")
-    private_key = Column(String(2000), nullable=False, comment="RSA私钥")
+    public_key = Column(String(1000), nullable=False, comment="公钥")
+    private_key = Column(String(2000), nullable=False, comment="私钥")
+    signing_algorithm = Column(Enum(SigningAlgorithm), default=SigningAlgorithm.RS256, nullable=False, comment="Token签名算法")
     heartbeat_interval = Column(Integer, default=3600, comment="心跳间隔（秒）")
     status = Column(Enum(ProductStatus), default=ProductStatus.ENABLED, comment="产品状态")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
@@ -28,6 +28,7 @@ try:
     class LicenseResponse(LicenseBase):
         id: int
         status: LicenseStatus
+        active_devices: int = 0
         created_at: datetime
         
         class Config:
@@ -76,6 +77,7 @@ except ImportError:
     class LicenseResponse(LicenseBase):
         id: int
         status: LicenseStatus
+        active_devices: int = 0
         created_at: datetime
         
         class Config:
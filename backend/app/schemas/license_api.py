@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 try:
@@ -26,6 +26,15 @@ try:
         success: bool
         message: str
     
+    # 批量心跳请求
+    class BatchHeartbeatRequest(BaseModel):
+        tokens: Annotated[List[Dict[str, Any]], Field(..., min_length=1, max_length=1000)]
+    
+    # 批量心跳响应，results与tokens按顺序一一对应
+    class BatchHeartbeatResponse(BaseModel):
+        success: bool
+        results: List[HeartbeatResponse]
+    
     # 状态请求
     class StatusRequest(BaseModel):
         token: Dict[str, Any]
@@ -112,6 +121,15 @@ except ImportError:
                 }
             }
     
+    # 批量心跳请求
+    class BatchHeartbeatRequest(BaseModel):
+        tokens: List[Dict[str, Any]]
+    
+    # 批量心跳响应，results与tokens按顺序一一对应
+    class BatchHeartbeatResponse(BaseModel):
+        success: bool
+        results: List[HeartbeatResponse]
+    
     # 状态请求
     class StatusRequest(BaseModel):
         token: Dict[str, Any]
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
-from app.models.product import ProductStatus
+from app.models.product import ProductStatus, SigningAlgorithm
 
 try:
     from typing_extensions import Annotated
@@ -12,6 +12,8 @@ try:
         name: Annotated[str, Field(..., min_length=1, max_length=100)]
         heartbeat_interval: Optional[int] = Field(default=3600, ge=60, le=86400)
         status: Optional[ProductStatus] = Field(default=ProductStatus.ENABLED)
+        # 创建后不可修改，已签发的Token依赖该算法验证
+        signing_algorithm: Optional[SigningAlgorithm] = Field(default=SigningAlgorithm.RS256)
     
     # 创建产品请求
     class ProductCreate(ProductBase):
@@ -40,6 +42,7 @@ except ImportError:
         name: str
         heartbeat_interval: Optional[int] = 3600
         status: Optional[ProductStatus] = ProductStatus.ENABLED
+        signing_algorithm: Optional[SigningAlgorithm] = SigningAlgorithm.RS256
         
         class Config:
             schema_extra = {
@@ -47,7 +50,8 @@ except ImportError:
                     "product_code": "XRAY_GUI",
                     "name": "Xray GUI",
                     "heartbeat_interval": 3600,
-                    "status": "enabled"
+                    "status": "enabled",
+                    "signing_algorithm": "RS256"
                 }
             }
     
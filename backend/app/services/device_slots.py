@@ -0,0 +1,49 @@
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.license import License
+
+# 设备名额维护
+# License.active_devices 记录未禁用（正常/异常）的客户端数量，
+# 所有增减都在调用方的事务中以单条条件UPDATE完成，由调用方提交或回滚。
+
+def _reserve_stmt(license_id: int):
+    return (
+        update(License)
+        .where(License.id == license_id, License.active_devices < License.max_devices)
+        .values(active_devices=License.active_devices + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def _release_stmt(license_id: int):
+    return (
+        update(License)
+        .where(License.id == license_id, License.active_devices > 0)
+        .values(active_devices=License.active_devices - 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def _add_stmt(license_id: int):
+    return (
+        update(License)
+        .where(License.id == license_id)
+        .values(active_devices=License.active_devices + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+# 占用一个设备名额，名额已满时返回False
+def reserve_device_slot(db: Session, license_id: int) -> bool:
+    return db.execute(_reserve_stmt(license_id)).rowcount == 1
+
+# 释放一个设备名额
+def release_device_slot(db: Session, license_id: int):
+    db.execute(_release_stmt(license_id))
+
+# 不检查上限增加一个设备名额（管理员手动启用客户端）
+def add_device_slot(db: Session, license_id: int):
+    db.execute(_add_stmt(license_id))
+
+# 异步占用一个设备名额
+async def areserve_device_slot(db: AsyncSession, license_id: int) -> bool:
+    result = await db.execute(_reserve_stmt(license_id))
+    return result.rowcount == 1
@@ -0,0 +1,200 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from sqlalchemy import bindparam, update
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.client import Client
+
+logger = logging.getLogger(__name__)
+
+# 心跳写缓冲
+class HeartbeatBuffer:
+    """
+    心跳时间写回缓冲
+
+    内存中只保留每个客户端最新的心跳时间，按时间间隔或数量阈值
+    批量写回数据库，数据库写入频率取决于刷新频率而不是请求频率。
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        flush_interval: float = 5.0,
+        batch_size: int = 1000,
+        max_size: int = 100000,
+        coarsen_seconds: int = 0
+    ):
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_size = max_size
+        self.coarsen_window = timedelta(seconds=coarsen_seconds)
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 指标
+        self._recorded = 0
+        self._coalesced = 0
+        self._skipped = 0
+        self._dropped = 0
+        self._written = 0
+        self._flushes = 0
+        self._flush_errors = 0
+        self._last_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    # 判断库中的心跳时间是否仍在合并窗口内
+    def _within_window(self, stored: Optional[datetime], ts: datetime) -> bool:
+        if not self.coarsen_window or stored is None:
+            return False
+        if stored.tzinfo is not None:
+            stored = stored.astimezone(timezone.utc).replace(tzinfo=None)
+        return ts - stored < self.coarsen_window
+
+    # 记录心跳
+    def record(self, client_id: int, ts: datetime, stored: Optional[datetime] = None) -> bool:
+        """
+        记录客户端心跳时间
+
+        Args:
+            client_id: 客户端ID
+            ts: 心跳时间（UTC）
+            stored: 数据库中当前的心跳时间（可选），用于合并窗口判断
+
+        Returns:
+            是否进入缓冲（被合并窗口跳过或因缓冲已满被丢弃时返回False）
+        """
+        if self._within_window(stored, ts):
+            with self._lock:
+                self._skipped += 1
+            return False
+
+        with self._lock:
+            self._recorded += 1
+            previous = self._pending.get(client_id)
+            if previous is not None:
+                self._coalesced += 1
+                if ts > previous:
+                    self._pending[client_id] = ts
+                return True
+            if len(self._pending) >= self.max_size:
+                self._dropped += 1
+                return False
+            self._pending[client_id] = ts
+            depth = len(self._pending)
+
+        if depth >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    # 批量写回数据库
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, {}
+
+            start = time.perf_counter()
+            items = list(batch.items())
+            table = Client.__table__
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("_id"))
+                .values(last_heartbeat=bindparam("_ts"))
+            )
+            written = 0
+            db = self._session_factory()
+            try:
+                for i in range(0, len(items), self.batch_size):
+                    chunk = items[i:i + self.batch_size]
+                    db.connection().execute(stmt, [{"_id": cid, "_ts": ts} for cid, ts in chunk])
+                    db.commit()
+                    written += len(chunk)
+            except Exception:
+                db.rollback()
+                logger.exception("Failed to flush heartbeat buffer")
+                self._requeue(items[written:])
+                with self._lock:
+                    self._flush_errors += 1
+            finally:
+                db.close()
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self._flushes += 1
+                self._written += written
+                self._last_flush_ms = elapsed_ms
+                self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+                self._total_flush_ms += elapsed_ms
+            return written
+
+    # 写回失败时放回缓冲，保留较新的时间
+    def _requeue(self, items):
+        with self._lock:
+            for client_id, ts in items:
+                previous = self._pending.get(client_id)
+                if previous is not None:
+                    if ts > previous:
+                        self._pending[client_id] = ts
+                elif len(self._pending) < self.max_size:
+                    self._pending[client_id] = ts
+                else:
+                    self._dropped += 1
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Heartbeat flush loop error")
+
+    # 启动后台刷新线程
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="heartbeat-flusher", daemon=True)
+        self._thread.start()
+
+    # 停止后台线程并写回剩余数据
+    def stop(self):
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    # 统计信息
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "queueDepth": len(self._pending),
+                "recorded": self._recorded,
+                "coalesced": self._coalesced,
+                "skipped": self._skipped,
+                "dropped": self._dropped,
+                "written": self._written,
+                "flushes": self._flushes,
+                "flushErrors": self._flush_errors,
+                "lastFlushMs": round(self._last_flush_ms, 3),
+                "maxFlushMs": round(self._max_flush_ms, 3),
+                "avgFlushMs": round(self._total_flush_ms / self._flushes, 3) if self._flushes else 0.0
+            }
+
+heartbeat_buffer = HeartbeatBuffer(
+    flush_interval=settings.HEARTBEAT_FLUSH_INTERVAL,
+    batch_size=settings.HEARTBEAT_FLUSH_BATCH_SIZE,
+    max_size=settings.HEARTBEAT_BUFFER_MAX_SIZE,
+    coarsen_seconds=settings.HEARTBEAT_COARSEN_SECONDS
+)
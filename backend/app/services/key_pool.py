@@ -0,0 +1,174 @@
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.rsa import generate_rsa_key_pair
+
+logger = logging.getLogger(__name__)
+
+# RSA密钥对预生成池
+class KeyPool:
+    """
+    后台预生成RSA-2048密钥对
+
+    由进程池在后台补充到目标数量，create_product以O(1)取用；池为空时由调用方回退到同步生成。
+    配置了持久化路径和加密密钥时，停止时把剩余密钥对加密写入磁盘，启动时加载并立即删除文件，
+    保证同一密钥对不会被两个工作进程重复取用。
+    """
+
+    def __init__(
+        self,
+        target_size: int = 8,
+        max_workers: int = 1,
+        persist_path: Optional[str] = None,
+        encryption_key: Optional[str] = None
+    ):
+        self.target_size = target_size
+        self.max_workers = max_workers
+        self.persist_path = persist_path
+        self.encryption_key = encryption_key
+        self._keys: Deque[Tuple[str, str]] = deque()
+        # 可重入锁：已完成的future会在add_done_callback内同步回调
+        self._lock = threading.RLock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        # 指标
+        self._generated = 0
+        self._taken = 0
+        self._empty = 0
+        self._failures = 0
+        self._loaded = 0
+        self._completions: Deque[float] = deque(maxlen=100)
+
+    def _fernet(self):
+        from cryptography.fernet import Fernet
+        return Fernet(self.encryption_key.encode("utf-8"))
+
+    # 加载持久化的密钥对
+    def _load(self):
+        if not self.persist_path or not self.encryption_key or not os.path.exists(self.persist_path):
+            return
+        # 先原子地改名认领文件，避免多个工作进程加载同一批密钥
+        claimed = f"{self.persist_path}.{os.getpid()}"
+        try:
+            os.replace(self.persist_path, claimed)
+        except FileNotFoundError:
+            return
+        try:
+            with open(claimed, "rb") as f:
+                pairs = json.loads(self._fernet().decrypt(f.read()))
+            with self._lock:
+                self._keys.extend(tuple(pair) for pair in pairs)
+                self._loaded += len(pairs)
+        except Exception:
+            logger.exception("Failed to load persisted key pool")
+        finally:
+            os.remove(claimed)
+
+    # 加密保存剩余的密钥对
+    def _persist(self):
+        if not self.persist_path or not self.encryption_key:
+            return
+        with self._lock:
+            pairs = list(self._keys)
+            self._keys.clear()
+        if not pairs:
+            return
+        tmp_path = f"{self.persist_path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(self._fernet().encrypt(json.dumps(pairs).encode("utf-8")))
+        os.replace(tmp_path, self.persist_path)
+
+    # 补充密钥对到目标数量
+    def _refill(self):
+        with self._lock:
+            if self._executor is None:
+                return
+            missing = self.target_size - len(self._keys) - self._in_flight
+            for _ in range(max(0, missing)):
+                future = self._executor.submit(generate_rsa_key_pair)
+                self._in_flight += 1
+                future.add_done_callback(self._on_generated)
+
+    def _on_generated(self, future):
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                self._failures += 1
+                logger.error("Key pair generation failed: %s", error)
+                return
+            self._keys.append(future.result())
+            self._generated += 1
+            self._completions.append(time.monotonic())
+
+    # 启动进程池并开始补充
+    def start(self):
+        if self._executor is not None:
+            return
+        self._load()
+        # 使用spawn避免在多线程进程中fork
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self._refill()
+
+    # 停止进程池并持久化剩余密钥对
+    def stop(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        try:
+            self._persist()
+        except Exception:
+            logger.exception("Failed to persist key pool")
+
+    # 取出一个密钥对，池为空时返回None
+    def take(self) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            pair = self._keys.popleft() if self._keys else None
+            if pair is None:
+                self._empty += 1
+            else:
+                self._taken += 1
+        self._refill()
+        return pair
+
+    # 统计信息
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            completions = list(self._completions)
+            # 最近补充速率（个/秒）
+            refill_rate = 0.0
+            if len(completions) >= 2 and completions[-1] > completions[0]:
+                refill_rate = (len(completions) - 1) / (completions[-1] - completions[0])
+            return {
+                "running": self._executor is not None,
+                "depth": len(self._keys),
+                "target": self.target_size,
+                "inFlight": self._in_flight,
+                "generated": self._generated,
+                "loaded": self._loaded,
+                "taken": self._taken,
+                "empty": self._empty,
+                "failures": self._failures,
+                "refillRate": round(refill_rate, 3)
+            }
+
+key_pool = KeyPool(
+    target_size=settings.KEY_POOL_SIZE,
+    max_workers=settings.KEY_POOL_WORKERS,
+    persist_path=settings.KEY_POOL_PERSIST_PATH,
+    encryption_key=settings.KEY_POOL_ENCRYPTION_KEY
+)
@@ -0,0 +1,75 @@
+import hashlib
+import threading
+from typing import Any, Dict, Tuple
+from app.core.rsa import ALG_RS256, create_signer, create_verifier
+
+# 产品密钥注册表
+class KeyRegistry:
+    """
+    按产品缓存已解析的签名器/验证器
+
+    缓存键为 (product_code, 签名算法, 密钥指纹)，密钥内容变化时指纹随之变化，
+    不会命中旧对象；产品更新或删除时调用 invalidate 主动清理。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signers: Dict[Tuple[str, str, str], Any] = {}
+        self._verifiers: Dict[Tuple[str, str, str], Any] = {}
+        self._hits = 0
+        self._misses = 0
+
+    # 计算密钥指纹
+    @staticmethod
+    def fingerprint(key_pem: str) -> str:
+        return hashlib.sha256(key_pem.encode("utf-8")).hexdigest()[:16]
+
+    def _get(self, cache: Dict[Tuple[str, str, str], Any], product_code: str, key_pem: str, algorithm: str, factory):
+        cache_key = (product_code, algorithm, self.fingerprint(key_pem))
+        with self._lock:
+            obj = cache.get(cache_key)
+            if obj is not None:
+                self._hits += 1
+                return obj
+            self._misses += 1
+        # 在锁外解析PEM，避免阻塞其他产品的查询
+        obj = factory(key_pem, algorithm)
+        with self._lock:
+            # 同一产品只保留当前指纹对应的对象
+            for stale_key in [k for k in cache if k[0] == product_code and k != cache_key]:
+                del cache[stale_key]
+            cache[cache_key] = obj
+        return obj
+
+    # 获取签名器
+    def get_signer(self, product_code: str, private_key: str, algorithm: str = ALG_RS256):
+        return self._get(self._signers, product_code, private_key, algorithm, create_signer)
+
+    # 获取验证器
+    def get_verifier(self, product_code: str, public_key: str, algorithm: str = ALG_RS256):
+        return self._get(self._verifiers, product_code, public_key, algorithm, create_verifier)
+
+    # 失效指定产品的缓存
+    def invalidate(self, product_code: str):
+        with self._lock:
+            for cache in (self._signers, self._verifiers):
+                for key in [k for k in cache if k[0] == product_code]:
+                    del cache[key]
+
+    # 清空所有缓存
+    def clear(self):
+        with self._lock:
+            self._signers.clear()
+            self._verifiers.clear()
+
+    # 统计信息
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "signers": len(self._signers),
+                "verifiers": len(self._verifiers)
+            }
+
+key_registry = KeyRegistry()
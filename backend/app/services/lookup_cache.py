@@ -0,0 +1,294 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.product import Product, ProductStatus, SigningAlgorithm
+from app.models.license import License, LicenseStatus
+from app.models.client import Client, ClientStatus
+
+# 产品快照
+class ProductSnapshot(NamedTuple):
+    id: int
+    product_code: str
+    public_key: str
+    private_key: str
+    heartbeat_interval: int
+    status: ProductStatus
+    signing_algorithm: str
+
+# 授权快照
+class LicenseSnapshot(NamedTuple):
+    id: int
+    license_key: str
+    product_code: str
+    max_devices: int
+    expire_at: date
+    status: LicenseStatus
+
+# 客户端快照
+class ClientSnapshot(NamedTuple):
+    id: int
+    license_id: int
+    product_code: str
+    client_fp: str
+    status: ClientStatus
+    last_heartbeat: Optional[datetime]
+
+def snapshot_product(product: Product) -> ProductSnapshot:
+    return ProductSnapshot(
+        id=product.id,
+        product_code=product.product_code,
+        public_key=product.public_key,
+        private_key=product.private_key,
+        heartbeat_interval=product.heartbeat_interval,
+        status=product.status,
+        signing_algorithm=SigningAlgorithm(product.signing_algorithm or SigningAlgorithm.RS256).value
+    )
+
+def snapshot_license(license: License) -> LicenseSnapshot:
+    return LicenseSnapshot(
+        id=license.id,
+        license_key=license.license_key,
+        product_code=license.product_code,
+        max_devices=license.max_devices,
+        expire_at=license.expire_at,
+        status=license.status
+    )
+
+def snapshot_client(client: Client) -> ClientSnapshot:
+    return ClientSnapshot(
+        id=client.id,
+        license_id=client.license_id,
+        product_code=client.product_code,
+        client_fp=client.client_fp,
+        status=client.status,
+        last_heartbeat=client.last_heartbeat
+    )
+
+# 批量查询时IN列表的分块大小
+IN_CHUNK_SIZE = 500
+
+def _chunks(items: List[Any], size: int = IN_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+# 带TTL的LRU缓存
+class TTLCache:
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    # 按条件批量失效
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions
+            }
+
+# 客户端API热路径查询缓存
+class LookupCache:
+    """
+    产品、授权、客户端的进程内读穿缓存
+
+    只缓存不可变快照，不缓存ORM实例；管理端写操作会立即失效对应条目，
+    其他工作进程中的条目最多在TTL后过期，TTL即吊销生效的时间上限。
+    """
+
+    def __init__(self, enabled: bool, max_size: int, ttl: float):
+        self.enabled = enabled
+        self.products = TTLCache(max_size, ttl)
+        self.licenses = TTLCache(max_size, ttl)
+        self.clients = TTLCache(max_size, ttl)
+
+    def _cached(self, cache: TTLCache, key: Hashable):
+        return cache.get(key) if self.enabled else None
+
+    def _store(self, cache: TTLCache, key: Hashable, snapshot):
+        if self.enabled and snapshot is not None:
+            cache.put(key, snapshot)
+        return snapshot
+
+    # 查询产品
+    def get_product(self, db: Session, product_code: str) -> Optional[ProductSnapshot]:
+        snapshot = self._cached(self.products, product_code)
+        if snapshot is not None:
+            return snapshot
+        product = db.query(Product).filter(Product.product_code == product_code).first()
+        return self._store(self.products, product_code, product and snapshot_product(product))
+
+    # 查询授权
+    def get_license(self, db: Session, license_key: str) -> Optional[LicenseSnapshot]:
+        snapshot = self._cached(self.licenses, license_key)
+        if snapshot is not None:
+            return snapshot
+        license = db.query(License).filter(License.license_key == license_key).first()
+        return self._store(self.licenses, license_key, license and snapshot_license(license))
+
+    # 查询客户端
+    def get_client(self, db: Session, license_id: int, client_fp: str) -> Optional[ClientSnapshot]:
+        key = (license_id, client_fp)
+        snapshot = self._cached(self.clients, key)
+        if snapshot is not None:
+            return snapshot
+        client = db.query(Client).filter(
+            Client.license_id == license_id,
+            Client.client_fp == client_fp
+        ).first()
+        return self._store(self.clients, key, client and snapshot_client(client))
+
+    # 异步查询产品
+    async def aget_product(self, db: AsyncSession, product_code: str) -> Optional[ProductSnapshot]:
+        snapshot = self._cached(self.products, product_code)
+        if snapshot is not None:
+            return snapshot
+        result = await db.execute(select(Product).where(Product.product_code == product_code))
+        product = result.scalars().first()
+        return self._store(self.products, product_code, product and snapshot_product(product))
+
+    # 异步查询授权
+    async def aget_license(self, db: AsyncSession, license_key: str) -> Optional[LicenseSnapshot]:
+        snapshot = self._cached(self.licenses, license_key)
+        if snapshot is not None:
+            return snapshot
+        result = await db.execute(select(License).where(License.license_key == license_key))
+        license = result.scalars().first()
+        return self._store(self.licenses, license_key, license and snapshot_license(license))
+
+    # 异步查询客户端
+    async def aget_client(self, db: AsyncSession, license_id: int, client_fp: str) -> Optional[ClientSnapshot]:
+        key = (license_id, client_fp)
+        snapshot = self._cached(self.clients, key)
+        if snapshot is not None:
+            return snapshot
+        result = await db.execute(select(Client).where(
+            Client.license_id == license_id,
+            Client.client_fp == client_fp
+        ))
+        client = result.scalars().first()
+        return self._store(self.clients, key, client and snapshot_client(client))
+
+    # 批量读取缓存，返回命中结果和未命中的键
+    def _cached_many(self, cache: TTLCache, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Any], List[Hashable]]:
+        found, missing = {}, []
+        for key in set(keys):
+            snapshot = self._cached(cache, key)
+            if snapshot is not None:
+                found[key] = snapshot
+            else:
+                missing.append(key)
+        return found, missing
+
+    # 批量查询授权
+    def get_licenses(self, db: Session, license_keys: Iterable[str]) -> Dict[str, LicenseSnapshot]:
+        found, missing = self._cached_many(self.licenses, license_keys)
+        for chunk in _chunks(missing):
+            for license in db.query(License).filter(License.license_key.in_(chunk)):
+                found[license.license_key] = self._store(self.licenses, license.license_key, snapshot_license(license))
+        return found
+
+    # 批量查询客户端，键为 (license_id, client_fp)
+    def get_clients(self, db: Session, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], ClientSnapshot]:
+        found, missing = self._cached_many(self.clients, keys)
+        for chunk in _chunks(missing):
+            for client in db.query(Client).filter(tuple_(Client.license_id, Client.client_fp).in_(chunk)):
+                key = (client.license_id, client.client_fp)
+                found[key] = self._store(self.clients, key, snapshot_client(client))
+        return found
+
+    # 异步批量查询授权
+    async def aget_licenses(self, db: AsyncSession, license_keys: Iterable[str]) -> Dict[str, LicenseSnapshot]:
+        found, missing = self._cached_many(self.licenses, license_keys)
+        for chunk in _chunks(missing):
+            result = await db.execute(select(License).where(License.license_key.in_(chunk)))
+            for license in result.scalars():
+                found[license.license_key] = self._store(self.licenses, license.license_key, snapshot_license(license))
+        return found
+
+    # 异步批量查询客户端
+    async def aget_clients(self, db: AsyncSession, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], ClientSnapshot]:
+        found, missing = self._cached_many(self.clients, keys)
+        for chunk in _chunks(missing):
+            result = await db.execute(select(Client).where(tuple_(Client.license_id, Client.client_fp).in_(chunk)))
+            for client in result.scalars():
+                key = (client.license_id, client.client_fp)
+                found[key] = self._store(self.clients, key, snapshot_client(client))
+        return found
+
+    def invalidate_product(self, product_code: str):
+        self.products.invalidate(product_code)
+
+    def invalidate_license(self, license_key: str):
+        self.licenses.invalidate(license_key)
+
+    def invalidate_client(self, license_id: int, client_fp: str):
+        self.clients.invalidate((license_id, client_fp))
+
+    # 失效某个授权下的全部客户端
+    def invalidate_license_clients(self, license_id: int):
+        self.clients.invalidate_where(lambda key: key[0] == license_id)
+
+    def clear(self):
+        self.products.clear()
+        self.licenses.clear()
+        self.clients.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "products": self.products.stats(),
+            "licenses": self.licenses.stats(),
+            "clients": self.clients.stats()
+        }
+
+lookup_cache = LookupCache(
+    enabled=settings.LOOKUP_CACHE_ENABLED,
+    max_size=settings.LOOKUP_CACHE_MAX_SIZE,
+    ttl=settings.LOOKUP_CACHE_TTL
+)
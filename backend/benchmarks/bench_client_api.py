@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+客户端API同步/异步实现的延迟对比
+
+在临时SQLite数据库上分别以 DATABASE_ASYNC=false/true 启动应用（进程内ASGI调用），
+对 /api/v1/license/heartbeat 和 /status 发起并发请求，输出吞吐量和延迟分位数。
+
+用法:
+    python benchmarks/bench_client_api.py --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, p):
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def run_worker(args):
+    import httpx
+    from app.core.database import Base, engine, SessionLocal
+    from app.core.rsa import generate_rsa_key_pair
+    from app.models.product import Product
+    from app.models.license import License
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    private_key, public_key = generate_rsa_key_pair()
+    db = SessionLocal()
+    db.add(Product(product_code="BENCH", name="bench", public_key=public_key, private_key=private_key))
+    db.add(License(license_key="BENCH-0000-0001", product_code="BENCH", max_devices=1, expire_at=date(2099, 1, 1)))
+    db.commit()
+    db.close()
+
+    await app.router.startup()
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            response = await client.post("/api/v1/license/activate", json={
+                "license_key": "BENCH-0000-0001",
+                "client_fp": "BENCH-FINGERPRINT",
+                "client_type": "service"
+            })
+            token = response.json()["token"]
+
+            results = {}
+            for path in ("/api/v1/license/heartbeat", "/api/v1/license/status"):
+                latencies = []
+                semaphore = asyncio.Semaphore(args.concurrency)
+
+                async def call():
+                    async with semaphore:
+                        start = time.perf_counter()
+                        r = await client.post(path, json={"token": token})
+                        latencies.append((time.perf_counter() - start) * 1000)
+                        assert r.json()["success"], r.text
+
+                start = time.perf_counter()
+                await asyncio.gather(*(call() for _ in range(args.requests)))
+                elapsed = time.perf_counter() - start
+                results[path] = {
+                    "rps": round(args.requests / elapsed, 1),
+                    "p50_ms": round(percentile(latencies, 50), 2),
+                    "p99_ms": round(percentile(latencies, 99), 2),
+                }
+    finally:
+        await app.router.shutdown()
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        sys.path.insert(0, BACKEND_DIR)
+        asyncio.run(run_worker(args))
+        return
+
+    for mode in ("false", "true"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                DATABASE_URL=f"sqlite:///{tmp}/bench.db",
+                DATABASE_ASYNC=mode,
+                KEY_POOL_ENABLED="false",
+                JWT_SECRET_KEY=os.environ.get("JWT_SECRET_KEY", "bench"),
+            )
+            output = subprocess.run(
+                [sys.executable, __file__, "--worker",
+                 "--requests", str(args.requests), "--concurrency", str(args.concurrency)],
+                cwd=BACKEND_DIR, env=env, check=True, capture_output=True, text=True
+            ).stdout
+            results = json.loads(output.strip().splitlines()[-1])
+        label = "async" if mode == "true" else "sync"
+        for path, row in results.items():
+            print(f"{label:<6} {path:<28} {row['rps']:>9} req/s  p50 {row['p50_ms']:>7} ms  p99 {row['p99_ms']:>7} ms")
+
+
+if __name__ == "__main__":
+    main()